@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
-import json
+import csv
+import io
 import sys
 import os
 import asyncio
+import functools
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, unquote
+import orjson
 import pyodbc
+import aioodbc
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 from pydantic import AnyUrl
@@ -13,15 +20,46 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Connections are pooled by aioodbc; ODBC driver-manager pooling on top of that
+# only keeps extra idle sockets around (and leaks them on some platforms)
+pyodbc.pooling = False
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mssql_mcp_server")
 
-# Log all environment variables for debugging
-logger.info(f"Received env: {dict(os.environ)}")
-
 app = Server("mssql_mcp_server")
 
+TABLES_SQL = "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
+
+# Run before a connection goes back to the pool. Driver-level pooling (and
+# with it sp_reset_connection) is off, so nothing else ends a transaction a
+# query left open
+RESET_SQL = "IF @@TRANCOUNT > 0 ROLLBACK"
+
+# ODBC connection attribute for the TDS packet size (not exported by pyodbc)
+SQL_ATTR_PACKET_SIZE = 112
+
+# Isolation levels accepted for MSSQL_ISOLATION
+ISOLATION_LEVELS = {"READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SNAPSHOT", "SERIALIZABLE"}
+
+# Rows pulled from the driver per fetchmany() call
+FETCH_SIZE = 5000
+# execute_sql stops reading a result set after this many rows
+MAX_ROWS = int(os.getenv("MAX_ROWS", 10000))
+# Rows of an execute_sql result echoed back to the caller
+DISPLAY_ROWS = 3
+
+# Upper bound on queries accepted by a single batch_execute_sql call
+MAX_BATCH_QUERIES = 25
+
+# execute_sql calls arriving within this window share one round trip
+BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", 5))
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", 16))
+# Column name of the marker result sets separating queries in a merged batch
+BATCH_TAG = "__mcp_batch_index"
+
+
 class DBConfig:
     def __init__(self):
         self.config = {
@@ -40,50 +78,219 @@ class DBConfig:
             if len(server_parts) > 1:
                 self.config["port"] = server_parts[1]
         
-        logger.info(f"Using database: {self.config['database']} on server: {self.config['server']}:{self.config['port']}")
-        self.connection = None
+        logger.info("Using database: %s on server: %s:%s", self.config['database'], self.config['server'], self.config['port'])
 
-    def get_connection(self):
-        try:
-            # Check if connection is alive
-            if self.connection:
+        self.dsn = (
+            f"DRIVER={self.config['driver']};"
+            f"SERVER={self.config['server']},{self.config['port']};"
+            f"DATABASE={self.config['database']};"
+            f"UID={self.config['user']};"
+            f"PWD={self.config['password']};"
+            "Encrypt=yes;"
+            "TrustServerCertificate=yes;"
+            "Connection Timeout=30;"
+            "ConnectRetryCount=3;"
+            "ConnectRetryInterval=10"
+        )
+        # Larger TDS packets mean fewer round trips on bulk result sets;
+        # the server negotiates this down if it allows less
+        self.packet_size = int(os.getenv("MSSQL_PACKET_SIZE", 32767))
+        # Bounds how long a runaway query can hold a pooled connection
+        self.query_timeout = int(os.getenv("QUERY_TIMEOUT_S", 30))
+        # Optional session isolation so reads don't wait on writers' locks
+        # (SNAPSHOT needs ALLOW_SNAPSHOT_ISOLATION enabled on the database)
+        self.isolation = os.getenv("MSSQL_ISOLATION", "").strip().upper().replace("_", " ") or None
+        if self.isolation is not None and self.isolation not in ISOLATION_LEVELS:
+            raise ValueError(f"Invalid MSSQL_ISOLATION: {self.isolation}")
+        # Re-applied with every reset, in the same round trip, in case a
+        # query got a different level past the validator
+        self.reset_sql = RESET_SQL
+        if self.isolation is not None:
+            self.reset_sql += f"; SET TRANSACTION ISOLATION LEVEL {self.isolation}"
+        self.pool_min = int(os.getenv("POOL_MIN", 2))
+        self.pool_max = int(os.getenv("POOL_MAX", 10))
+        self.pool = None
+        self._pool_lock = None
+        # aioodbc runs every driver call in an executor; a dedicated one sized
+        # to the pool keeps DB work from queueing behind other to_thread jobs
+        self.executor = ThreadPoolExecutor(max_workers=self.pool_max, thread_name_prefix="mssql")
+        self.connect_kwargs = {
+            "dsn": self.dsn,
+            "executor": self.executor,
+            "autocommit": True,
+            "readonly": True,
+            # Packet size can only be set before the connection is opened
+            "attrs_before": {SQL_ATTR_PACKET_SIZE: self.packet_size},
+            "after_created": self._init_session
+        }
+
+        # Table names change rarely, so resources/list is served from memory
+        self.tables_ttl = float(os.getenv("TABLES_CACHE_TTL", 60))
+        self._tables_cache: tuple[float, list[str]] | None = None
+        self._table_names: set[str] = set()
+        # Resources built from the cached table list, as (tables, resources)
+        self._resources_cache: tuple[list[str], list[Resource]] | None = None
+        # Pre-built CSV header line per table for read_resource, with the
+        # column names it was built from
+        self.column_headers: dict[str, tuple[tuple[str, ...], str]] = {}
+
+    async def get_pool(self):
+        # Created lazily so the pool binds to the running event loop
+        if self.pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self.pool is None:
+                    try:
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Attempting to connect with: %s", self.dsn.replace(self.config['password'], '***'))
+                        self.pool = await aioodbc.create_pool(
+                            minsize=self.pool_min,
+                            maxsize=self.pool_max,
+                            pool_recycle=300,
+                            **self.connect_kwargs
+                        )
+                        logger.info("Connection pool ready (min=%s, max=%s)", self.pool_min, self.pool_max)
+                    except Exception as e:
+                        logger.error("Database connection failed: %s", e)
+                        raise
+        return self.pool
+
+    async def _init_session(self, conn):
+        # Called by aioodbc with the raw pyodbc connection, once per physical
+        # connection rather than per request
+        def setup():
+            # pyodbc applies the connection's query timeout to every cursor
+            conn.timeout = self.query_timeout
+            # NOCOUNT drops the "rows affected" message after every statement
+            conn.execute("SET NOCOUNT ON; SET ARITHABORT ON").close()
+            if self.isolation is not None:
+                conn.execute(f"SET TRANSACTION ISOLATION LEVEL {self.isolation}").close()
+
+        await asyncio.get_running_loop().run_in_executor(self.executor, setup)
+
+    def _check_timeout(self, e):
+        # HYT00 means the driver cancelled the statement at the query timeout;
+        # the connection is still healthy, so it is neither retired nor retried
+        if e.args and e.args[0] == "HYT00":
+            raise TimeoutError(f"Query timed out after {self.query_timeout} seconds") from e
+
+    async def run(self, operation):
+        """Run ``operation(cursor)`` on a pooled connection.
+
+        A connection that fails at the driver level is retired from the pool
+        and the operation is retried once on a fresh connection.
+        """
+        pool = await self.get_pool()
+        for attempt in range(2):
+            async with pool.acquire() as conn:
+                # Not ``async with conn.cursor()``: its rollback-on-error fails
+                # on a connection aioodbc has already closed after a link
+                # failure, and that error would replace the original one
+                cursor = None
                 try:
-                    # Test the connection with a simple query
-                    self.connection.execute("SELECT 1").fetchall()
-                except:
-                    logger.info("Connection lost, reconnecting...")
-                    self.connection = None
-
-            if not self.connection:
-                conn_str = (
-                    f"DRIVER={self.config['driver']};"
-                    f"SERVER={self.config['server']},{self.config['port']};"
-                    f"DATABASE={self.config['database']};"
-                    f"UID={self.config['user']};"
-                    f"PWD={self.config['password']};"
-                    "Encrypt=yes;"
-                    "TrustServerCertificate=yes;"
-                    "Connection Timeout=30;"
-                    "ConnectRetryCount=3;"
-                    "ConnectRetryInterval=10"
+                    cursor = await conn.cursor()
+                    return await operation(cursor)
+                except (pyodbc.OperationalError, pyodbc.InterfaceError) as e:
+                    self._check_timeout(e)
+                    # Closed connections are dropped by the pool on release
+                    await conn.close()
+                    if attempt:
+                        raise
+                    logger.info("Connection lost, retrying on a fresh connection: %s", e)
+                finally:
+                    if cursor is not None and not conn.closed:
+                        await self._reset_session(conn, cursor)
+
+    async def _reset_session(self, conn, cursor):
+        try:
+            await cursor.execute(self.reset_sql)
+            await cursor.close()
+        except pyodbc.Error as e:
+            # A connection whose session state is unknown must not be reused
+            logger.warning("Session reset failed, retiring connection: %s", e)
+            await conn.close()
+
+    async def get_tables(self) -> list[str]:
+        if self._tables_cache and time.monotonic() - self._tables_cache[0] < self.tables_ttl:
+            return self._tables_cache[1]
+
+        async def fetch_tables(cursor):
+            await cursor.execute(TABLES_SQL)
+            return await cursor.fetchall()
+
+        tables = [row[0] for row in await self.run(fetch_tables)]
+        # Schemas may have changed too; headers are rebuilt on next read
+        self.column_headers.clear()
+        self._tables_cache = (time.monotonic(), tables)
+        self._table_names = set(tables)
+        return tables
+
+    async def is_known_table(self, name: str) -> bool:
+        await self.get_tables()
+        return name in self._table_names
+
+    async def get_resources(self) -> list[Resource]:
+        tables = await self.get_tables()
+        # Rebuilt only when the table list itself was re-fetched
+        if self._resources_cache is None or self._resources_cache[0] is not tables:
+            resources = [
+                Resource(
+                    # Percent-encoded so names with spaces etc. are valid URIs
+                    uri=f"mssql://{quote(table, safe='')}/data",
+                    name=f"Table: {table}",
+                    mimeType="application/json",
+                    description=f"Data in table {table}"
                 )
-                logger.info(f"Attempting to connect with: {conn_str.replace(self.config['password'], '***')}")
-                self.connection = pyodbc.connect(conn_str, readonly=True)
-                logger.info("Database connection successful")
-            return self.connection
-        except Exception as e:
-            logger.error(f"Database connection failed: {str(e)}")
-            self.connection = None
-            raise
+                for table in tables
+            ]
+            self._resources_cache = (tables, resources)
+        return self._resources_cache[1]
+
+    def invalidate_cache(self):
+        self._tables_cache = None
+        self._resources_cache = None
+        self.column_headers.clear()
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+        self.executor.shutdown(wait=False)
+
+# Compiled once so validation is a few regex passes instead of
+# repeated upper-casing and substring scans
+_ALLOWED_RE = re.compile(r"^\s*(SELECT|WITH|DECLARE)\b", re.IGNORECASE)
+_FORBIDDEN_RE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|TRUNCATE|MERGE|UPSERT|GRANT|REVOKE|DENY"
+    r"|EXEC(?:UTE)?|INTO|SP_\w*|XP_\w*|SHUTDOWN|KILL|BACKUP|RESTORE|DBCC|BULK"
+    r"|OPENROWSET|OPENQUERY|OPENDATASOURCE|RECONFIGURE|WAITFOR|USE"
+    r"|TRAN(?:SACTION)?|CURSOR)\b",
+    re.IGNORECASE
+)
+# SET outside variable assignment changes session options (ROWCOUNT,
+# TRANSACTION ISOLATION LEVEL, ...) that would outlive the query on a
+# pooled connection
+_SET_OPTION_RE = re.compile(r"\bSET\s+(?!@)", re.IGNORECASE)
+_STACKED_RE = re.compile(r";\s*\w")
+
+@functools.lru_cache(maxsize=1024)
+def _is_read_only(query: str) -> bool:
+    return (
+        _ALLOWED_RE.search(query) is not None
+        and _FORBIDDEN_RE.search(query) is None
+        and _SET_OPTION_RE.search(query) is None
+        and _STACKED_RE.search(query) is None
+    )
 
 class SQLValidator:
     @staticmethod
     def is_read_only_query(query: str) -> bool:
-        # Debug logging
-        logger.info(f"Validating query: {query[:50]}...")
+        logger.debug("Validating query: %.50s", query)
         
-        # Very simple check - just make sure it starts with SELECT
-        return query.strip().upper().startswith('SELECT')
+        # Agents often re-issue identical queries, so results are memoized
+        return _is_read_only(query)
 
 db = DBConfig()
 sql_validator = SQLValidator()
@@ -91,23 +298,9 @@ sql_validator = SQLValidator()
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        tables = cursor.execute(
-            "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
-        ).fetchall()
-        
-        return [
-            Resource(
-                uri=f"mssql://{table[0]}/data",
-                name=f"Table: {table[0]}",
-                mimeType="application/json",
-                description=f"Data in table {table[0]}"
-            )
-            for table in tables
-        ]
+        return await db.get_resources()
     except Exception as e:
-        logger.error(f"Failed to list resources: {str(e)}")
+        logger.error("Failed to list resources: %s", e)
         return []
 
 @app.read_resource()
@@ -116,24 +309,260 @@ async def read_resource(uri: AnyUrl) -> str:
     if not uri_str.startswith("mssql://"):
         raise ValueError(f"Invalid URI scheme: {uri_str}")
         
-    table = uri_str[8:].split('/')[0]
-    query = f"SELECT TOP 100 * FROM {table}"
-    
-    if not sql_validator.is_read_only_query(query):
-        raise ValueError("Only SELECT queries are allowed")
-        
+    table = unquote(uri_str[8:].split('/')[0])
+    try:
+        known = await db.is_known_table(table)
+    except Exception as e:
+        logger.error("Error reading table %s: %s", table, e)
+        raise RuntimeError(f"Database error: {str(e)}")
+    if not known:
+        raise ValueError(f"Unknown table: {table}")
+
+    # Same text for every read of a table, so SQL Server can reuse the plan;
+    # the name is bracket-quoted like QUOTENAME() would
+    query = "SELECT TOP 100 * FROM [" + table.replace("]", "]]") + "]"
+
+    async def fetch_csv(cursor):
+        await cursor.execute(query)
+        cursor.arraysize = FETCH_SIZE
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        names = tuple(desc[0] for desc in cursor.description)
+        cached = db.column_headers.get(table)
+        # A column added or renamed since the header was built doesn't
+        # raise an error, so the cached line is used only while the names
+        # still match
+        if cached is not None and cached[0] == names:
+            buf.write(cached[1])
+        else:
+            writer.writerow(names)
+            db.column_headers[table] = (names, buf.getvalue())
+        while True:
+            batch = await cursor.fetchmany(FETCH_SIZE)
+            if not batch:
+                break
+            # At most TOP 100 rows: cheaper to format inline than to hand
+            # the batch to a worker thread
+            writer.writerows(batch)
+        # Drop the terminator after the last line
+        return buf.getvalue()[:-1]
+
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query)
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        result = [",".join(map(str, row)) for row in rows]
-        return "\n".join([",".join(columns)] + result)
+        return await db.run(fetch_csv)
+    except pyodbc.Error as e:
+        # The table may have changed shape; rebuild its header next time
+        db.column_headers.pop(table, None)
+        logger.error("Error reading table %s: %s", table, e)
+        raise RuntimeError(f"Database error: {str(e)}")
     except Exception as e:
-        logger.error(f"Error reading table {table}: {str(e)}")
+        logger.error("Error reading table %s: %s", table, e)
         raise RuntimeError(f"Database error: {str(e)}")
 
+async def collect_rows(cursor):
+    """Read the current result set, keeping only the rows shown to the caller.
+
+    Rows are counted in chunks of at most FETCH_SIZE up to MAX_ROWS; only
+    one row beyond that is read, to detect truncation.
+    """
+    if cursor.description is None:
+        # e.g. a DECLARE/SET-only query
+        raise ValueError("Query did not return a result set")
+    columns = [desc[0] for desc in cursor.description]
+    cursor.arraysize = FETCH_SIZE
+    display_rows = []
+    row_count = 0
+    truncated = False
+    while True:
+        # One row past the cap is enough to know the result was truncated
+        batch = await cursor.fetchmany(min(FETCH_SIZE, MAX_ROWS - row_count + 1))
+        if not batch:
+            break
+        if len(display_rows) < DISPLAY_ROWS:
+            display_rows.extend(batch[:DISPLAY_ROWS - len(display_rows)])
+        row_count += len(batch)
+        if row_count > MAX_ROWS:
+            truncated = True
+            row_count = MAX_ROWS
+            logger.info("Result truncated at %d rows", MAX_ROWS)
+            break
+    return columns, display_rows, row_count, truncated
+
+def format_result(columns, display_rows, row_count, truncated=False) -> str:
+    # Column names are sent once instead of being repeated in a dict per row
+    formatted_result = orjson.dumps(
+        {
+            "columns": columns,
+            "rows": [tuple(map(str, row)) for row in display_rows],
+            # With truncated set, total is the MAX_ROWS cap, not the full count
+            "total": row_count,
+            "truncated": truncated
+        },
+        option=orjson.OPT_INDENT_2
+    ).decode()
+    
+    # Create a summary header
+    if truncated:
+        summary = f"Query returned more than {MAX_ROWS} rows. "
+    else:
+        summary = f"Query returned {row_count} rows. "
+    if row_count > DISPLAY_ROWS:
+        summary += f"Showing first {DISPLAY_ROWS} rows:"
+    
+    return f"{summary}\n\n{formatted_result}"
+
+async def run_query(query: str) -> str:
+    async def fetch_rows(cursor):
+        await cursor.execute(query)
+        return await collect_rows(cursor)
+
+    return format_result(*await db.run(fetch_rows))
+
+class QueryBatcher:
+    """Merges execute_sql calls that arrive close together.
+
+    Queries queued within ``window_ms`` of each other are sent as a single
+    multi-statement batch and the result sets are handed back to the
+    individual callers. If the merged batch fails or its result sets do
+    not line up with the queries, every query is re-run on its own so one
+    bad query cannot fail its neighbours. A timeout is reported only to the
+    query that hit it: the queries before it keep their results and the
+    ones after it are run on their own.
+    """
+
+    def __init__(self, window_ms: float, max_queries: int):
+        self.window = window_ms / 1000
+        self.max_queries = max_queries
+        self.queue = None
+        self._worker = None
+        self._tasks = set()
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self.queue = None
+
+    async def submit(self, query: str) -> str:
+        # Queries with their own statement separators cannot be split back
+        # out of a merged batch reliably, so they always run alone
+        if self.queue is None or self.max_queries < 2 or ";" in query:
+            return await run_query(query)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((query, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_queries:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run the batch in the background so the next window can fill up
+            task = asyncio.create_task(self._execute(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, batch):
+        batch = [(query, future) for query, future in batch if not future.done()]
+        if len(batch) == 1:
+            await self._execute_one(*batch[0])
+            return
+        if not batch:
+            return
+
+        queries = [query for query, _ in batch]
+        # Filled as result sets are read, so a timeout can be pinned on the
+        # query that was running when it fired
+        results = []
+
+        async def fetch_sets(cursor):
+            # Each query is preceded by a marker result set carrying its index
+            # and the batch ends with one more, so a query that returns zero
+            # or several result sets is detected instead of shifting results
+            # onto the wrong caller. Newlines keep a trailing -- comment from
+            # swallowing the separator.
+            statements = []
+            for i, query in enumerate(queries):
+                statements.append(f"SELECT {i} AS {BATCH_TAG}")
+                statements.append(query)
+            statements.append(f"SELECT {len(queries)} AS {BATCH_TAG}")
+            results.clear()
+            await cursor.execute("\n;\n".join(statements))
+
+            for i in range(len(queries)):
+                await self._expect_tag(cursor, i)
+                if not await cursor.nextset() or await self._read_tag(cursor) is not None:
+                    raise ValueError(f"Query {i} returned no result set in merged batch")
+                results.append(format_result(*await collect_rows(cursor)))
+                if not await cursor.nextset():
+                    raise ValueError(f"Merged batch ended after query {i}")
+            await self._expect_tag(cursor, len(queries))
+            return results
+
+        try:
+            await db.run(fetch_sets)
+        except TimeoutError as e:
+            # Re-running would give the runaway query a second full timeout
+            timed_out = len(results)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            if timed_out < len(batch):
+                query, future = batch[timed_out]
+                if not future.done():
+                    future.set_exception(e)
+                await asyncio.gather(*(self._execute_one(query, future) for query, future in batch[timed_out + 1:]))
+            return
+        except Exception as e:
+            logger.info("Merged batch of %d queries failed, running individually: %s", len(queries), e)
+            await asyncio.gather(*(self._execute_one(query, future) for query, future in batch))
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    async def _read_tag(cursor):
+        description = cursor.description
+        if description is None or len(description) != 1 or description[0][0] != BATCH_TAG:
+            return None
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def _expect_tag(self, cursor, index: int):
+        if await self._read_tag(cursor) != index:
+            raise ValueError(f"Result sets out of step with merged queries at query {index}")
+
+    async def _execute_one(self, query: str, future):
+        try:
+            result = await run_query(query)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+batcher = QueryBatcher(BATCH_WINDOW_MS, BATCH_MAX_QUERIES)
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     return [
@@ -147,11 +576,78 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["query"]
             }
+        ),
+        Tool(
+            name="batch_execute_sql",
+            description=f"Execute up to {MAX_BATCH_QUERIES} independent READ-ONLY SQL queries (SELECT only) concurrently",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "maxItems": MAX_BATCH_QUERIES,
+                        "description": "SQL SELECT queries to execute"
+                    },
+                    "max_concurrent": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "default": 8,
+                        "description": "Maximum number of queries running at once"
+                    }
+                },
+                "required": ["queries"]
+            }
+        ),
+        Tool(
+            name="refresh_tables",
+            description="Refresh the cached list of tables after schema changes",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
+async def batch_execute(arguments: dict) -> list[TextContent]:
+    queries = arguments.get("queries")
+    if not queries or not isinstance(queries, list):
+        raise ValueError("Queries are required")
+    if len(queries) > MAX_BATCH_QUERIES:
+        return [TextContent(type="text", text=f"Error: At most {MAX_BATCH_QUERIES} queries are allowed per batch")]
+
+    for i, query in enumerate(queries, 1):
+        if not isinstance(query, str) or not sql_validator.is_read_only_query(query):
+            return [TextContent(type="text", text=f"Error: Query {i}: Only SELECT queries are allowed")]
+
+    semaphore = asyncio.Semaphore(max(1, int(arguments.get("max_concurrent", 8))))
+
+    async def run_one(query: str) -> str:
+        async with semaphore:
+            try:
+                return await run_query(query)
+            except Exception as e:
+                return f"Error: {str(e)}"
+
+    results = await asyncio.gather(*(run_one(query) for query in queries))
+    return [
+        TextContent(type="text", text=f"[{i}] {result}")
+        for i, result in enumerate(results, 1)
+    ]
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    if name == "refresh_tables":
+        db.invalidate_cache()
+        try:
+            tables = await db.get_tables()
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+        return [TextContent(type="text", text=f"Table cache refreshed: {len(tables)} tables")]
+
+    if name == "batch_execute_sql":
+        return await batch_execute(arguments)
+
     if name != "execute_sql":
         raise ValueError(f"Unknown tool: {name}")
 
@@ -159,50 +655,26 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     if not query:
         raise ValueError("Query is required")
 
-    # Log the query and validation result
     validation_result = sql_validator.is_read_only_query(query)
-    logger.info(f"Query validation result: {validation_result}")
+    logger.debug("Query validation result: %s", validation_result)
     
     if not validation_result:
         return [TextContent(type="text", text="Error: Only SELECT queries are allowed")]
 
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        # Determine total number of rows for summary information
-        row_count = len(rows)
-        
-        # Convert rows to list of dictionaries for better readability
-        # Limit to first 20 rows for display
-        display_rows = rows[:3]
-        result_list = []
-        for row in display_rows:
-            row_dict = {}
-            for i, col in enumerate(columns):
-                row_dict[col] = str(row[i])
-            result_list.append(row_dict)
-            
-        # Format the result as JSON
-        formatted_result = json.dumps(result_list, indent=2)
-        
-        # Create a summary header
-        summary = f"Query returned {row_count} rows. "
-        if row_count > 3:
-            summary += f"Showing first 3 rows:"
-        
-        return [TextContent(type="text", text=f"{summary}\n\n{formatted_result}")]
+        return [TextContent(type="text", text=await batcher.submit(query))]
     except Exception as e:
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 async def main():
     from mcp.server.stdio import stdio_server
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    batcher.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        await batcher.stop()
+        await db.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import re
+import sys
+import types
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MSSQL_SERVER", "localhost")
+
+try:
+    import pyodbc
+except ImportError:
+    # No ODBC driver manager here; provide just enough of pyodbc for the
+    # server module and aioodbc to import. Connections come from FakeServer.
+    pyodbc = types.ModuleType("pyodbc")
+
+    class Error(Exception):
+        pass
+
+    class DatabaseError(Error):
+        pass
+
+    class InterfaceError(Error):
+        pass
+
+    class OperationalError(DatabaseError):
+        pass
+
+    class ProgrammingError(DatabaseError):
+        pass
+
+    pyodbc.Error = Error
+    pyodbc.DatabaseError = DatabaseError
+    pyodbc.InterfaceError = InterfaceError
+    pyodbc.OperationalError = OperationalError
+    pyodbc.ProgrammingError = ProgrammingError
+    pyodbc.Cursor = object
+    pyodbc.Connection = object
+    pyodbc.pooling = True
+    pyodbc.dataSources = lambda: {}
+    pyodbc.connect = None
+    sys.modules["pyodbc"] = pyodbc
+
+from src.mssql import server
+
+
+class FakeServer:
+    """Scripted stand-in for SQL Server behind ``pyodbc.connect``.
+
+    Statements are separated the way the server module joins them. Each
+    ``SELECT <n>`` yields a result set with ``n`` rows in column ``n``;
+    ``SELECT <n> AS <name>`` yields one row holding ``n``. Statements
+    without a SELECT produce no result set, as under SET NOCOUNT ON.
+    Statements listed in ``timeouts`` fail with HYT00 when they are reached.
+    """
+
+    def __init__(self):
+        self.tables = {"t1": (["a", "b"], [(1, 2), (3, 4)])}
+        self.executed = []
+        # Session statements: the SETs run on connect and the reset run
+        # before each release
+        self.session = []
+        # Exceptions raised by the next queries, in order (session SET
+        # statements run on connect are not affected)
+        self.errors = []
+        self.timeouts = set()
+        self.connections = 0
+        # Rows handed out by fetch calls across all cursors
+        self.fetched = 0
+
+    def connect(self, dsn, **kwargs):
+        self.connections += 1
+        return FakeConnection(self)
+
+    def result_sets(self, sql):
+        sets = []
+        for statement in sql.split("\n;\n"):
+            statement = statement.strip()
+            if statement in self.timeouts:
+                sets.append(None)
+                continue
+            if statement == server.TABLES_SQL:
+                sets.append((["TABLE_NAME"], [(name,) for name in self.tables]))
+                continue
+            table = re.fullmatch(r"SELECT TOP 100 \* FROM \[(.+)\]", statement)
+            if table:
+                sets.append(self.tables[table.group(1).replace("]]", "]")])
+                continue
+            for count, alias in re.findall(r"SELECT (\d+)(?: AS (\w+))?", statement):
+                if alias:
+                    sets.append(([alias], [(int(count),)]))
+                else:
+                    sets.append((["n"], [(i,) for i in range(int(count))]))
+        return sets
+
+
+class FakeConnection:
+    def __init__(self, fake):
+        self.fake = fake
+        self.closed = False
+        self.timeout = 0
+        self.autocommit = True
+
+    def cursor(self):
+        self._check_open()
+        return FakeCursor(self)
+
+    def execute(self, sql):
+        return self.cursor().execute(sql)
+
+    def _check_open(self):
+        if self.closed:
+            raise pyodbc.ProgrammingError("The cursor's connection has been closed.")
+
+    def commit(self):
+        self._check_open()
+
+    def rollback(self):
+        self._check_open()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.arraysize = 1
+        self.description = None
+        self._sets = []
+        self._rows = []
+
+    def execute(self, sql, *params):
+        self.conn._check_open()
+        fake = self.conn.fake
+        if sql.startswith(("SET ", server.RESET_SQL)):
+            fake.session.append(sql)
+            self._sets = []
+            self.nextset()
+            return self
+        fake.executed.append(sql)
+        if fake.errors:
+            error = fake.errors.pop(0)
+            if error.args and error.args[0] == "08S01":
+                self.conn.closed = True
+            raise error
+        self._sets = fake.result_sets(sql)
+        self.nextset()
+        return self
+
+    def nextset(self):
+        if not self._sets:
+            self.description = None
+            self._rows = []
+            return False
+        if self._sets[0] is None:
+            self._sets = []
+            raise pyodbc.OperationalError("HYT00", "Query timeout expired")
+        columns, rows = self._sets.pop(0)
+        self.description = [(column, None, None, None, None, None, True) for column in columns]
+        self._rows = list(rows)
+        return True
+
+    def fetchmany(self, size=0):
+        self.conn._check_open()
+        size = size or self.arraysize
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        self.conn.fake.fetched += len(batch)
+        return batch
+
+    def fetchone(self):
+        batch = self.fetchmany(1)
+        return batch[0] if batch else None
+
+    def fetchall(self):
+        return self.fetchmany(len(self._rows) or 1)
+
+    def commit(self):
+        self.conn._check_open()
+
+    def rollback(self):
+        self.conn._check_open()
+
+    def close(self):
+        self.conn._check_open()
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """A fresh DBConfig wired to a FakeServer; returns ``(fake, db)``."""
+    fake = FakeServer()
+    monkeypatch.setattr(pyodbc, "connect", fake.connect)
+    monkeypatch.setenv("POOL_MIN", "1")
+    db = server.DBConfig()
+    monkeypatch.setattr(server, "db", db)
+    return fake, db
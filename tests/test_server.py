@@ -0,0 +1,282 @@
+import asyncio
+
+import pyodbc
+import pytest
+
+from src.mssql import server
+
+
+def run(db, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await db.close()
+    return asyncio.run(main())
+
+
+def test_run_retries_after_link_failure(fake_server):
+    fake, db = fake_server
+    fake.errors.append(pyodbc.OperationalError("08S01", "Communication link failure"))
+
+    result = run(db, server.run_query("SELECT 2"))
+
+    assert result.startswith("Query returned 2 rows.")
+    assert fake.executed.count("SELECT 2") == 2
+    assert fake.connections == 2
+
+
+def test_run_does_not_retry_timeouts(fake_server):
+    fake, db = fake_server
+    fake.errors.append(pyodbc.OperationalError("HYT00", "Query timeout expired"))
+
+    try:
+        run(db, server.run_query("SELECT 2"))
+    except TimeoutError as e:
+        assert "timed out" in str(e)
+    else:
+        raise AssertionError("TimeoutError not raised")
+    assert fake.executed.count("SELECT 2") == 1
+
+
+def test_run_resets_session_before_release(fake_server):
+    fake, db = fake_server
+
+    async def main():
+        await server.run_query("SELECT 1")
+        await server.run_query("SELECT 2")
+
+    run(db, main())
+
+    assert fake.session.count(server.RESET_SQL) == 2
+    assert fake.session[-1] == server.RESET_SQL
+
+
+def test_run_reapplies_isolation_level_on_reset(fake_server, monkeypatch):
+    fake, _ = fake_server
+    monkeypatch.setenv("MSSQL_ISOLATION", "snapshot")
+    db = server.DBConfig()
+    monkeypatch.setattr(server, "db", db)
+
+    run(db, server.run_query("SELECT 1"))
+
+    assert fake.session[-1] == server.RESET_SQL + "; SET TRANSACTION ISOLATION LEVEL SNAPSHOT"
+
+
+def run_batched(db, queries):
+    async def main():
+        server.batcher.start()
+        try:
+            return await asyncio.gather(
+                *(server.batcher.submit(query) for query in queries),
+                return_exceptions=True
+            )
+        finally:
+            await server.batcher.stop()
+    return run(db, main())
+
+
+def test_batcher_merges_concurrent_queries(fake_server):
+    fake, db = fake_server
+
+    results = run_batched(db, ["SELECT 1", "SELECT 2", "SELECT 4"])
+
+    assert [result.split(".")[0] for result in results] == [
+        "Query returned 1 rows", "Query returned 2 rows", "Query returned 4 rows"
+    ]
+    assert len(fake.executed) == 1
+
+
+def test_batcher_falls_back_when_a_query_returns_two_result_sets(fake_server):
+    fake, db = fake_server
+
+    results = run_batched(db, ["SELECT 1 SELECT 2", "SELECT 3"])
+
+    assert results[1].startswith("Query returned 3 rows.")
+    assert sorted(fake.executed[1:]) == ["SELECT 1 SELECT 2", "SELECT 3"]
+
+
+def test_batcher_does_not_shift_results_when_set_counts_happen_to_match(fake_server):
+    fake, db = fake_server
+
+    # Two result sets plus none: the total still equals the query count
+    results = run_batched(db, ["SELECT 1 SELECT 2", "DECLARE @x int SELECT @x = 1"])
+
+    assert results[0].startswith("Query returned 1 rows.")
+    assert isinstance(results[1], Exception)
+
+
+def test_batcher_falls_back_when_a_query_returns_no_result_set(fake_server):
+    fake, db = fake_server
+
+    results = run_batched(db, ["DECLARE @x int SET @x = 1", "SELECT 2"])
+
+    assert results[1].startswith("Query returned 2 rows.")
+    assert "SELECT 2" in fake.executed[1:]
+
+
+def test_batcher_does_not_rerun_after_timeout(fake_server):
+    fake, db = fake_server
+    fake.errors.append(pyodbc.OperationalError("HYT00", "Query timeout expired"))
+
+    results = run_batched(db, ["SELECT 1", "SELECT 2"])
+
+    assert isinstance(results[0], TimeoutError)
+    assert results[1].startswith("Query returned 2 rows.")
+    assert fake.executed[1:] == ["SELECT 2"]
+
+
+def test_batcher_reports_timeout_only_to_the_query_that_hit_it(fake_server):
+    fake, db = fake_server
+    fake.timeouts.add("SELECT 7")
+
+    results = run_batched(db, ["SELECT 1", "SELECT 7", "SELECT 2"])
+
+    assert results[0].startswith("Query returned 1 rows.")
+    assert isinstance(results[1], TimeoutError)
+    assert results[2].startswith("Query returned 2 rows.")
+    assert fake.executed[1:] == ["SELECT 2"]
+
+
+def test_execute_sql_reads_only_one_row_past_max_rows(fake_server, monkeypatch):
+    fake, db = fake_server
+    monkeypatch.setattr(server, "MAX_ROWS", 100)
+
+    result = run(db, server.run_query("SELECT 5000"))
+
+    assert result.startswith("Query returned more than 100 rows.")
+    assert '"truncated": true' in result
+    assert fake.fetched == 101
+
+
+def test_execute_sql_counts_results_below_max_rows(fake_server, monkeypatch):
+    fake, db = fake_server
+    monkeypatch.setattr(server, "MAX_ROWS", 100)
+
+    result = run(db, server.run_query("SELECT 100"))
+
+    assert result.startswith("Query returned 100 rows.")
+    assert '"total": 100,\n  "truncated": false' in result
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT 1",
+    "  select * from t",
+    "WITH x AS (SELECT 1 AS n) SELECT * FROM x",
+    "DECLARE @n int = 1 SELECT @n",
+    "SELECT REPLACE(name, 'a', 'b') FROM t",
+    "SELECT LastUpdate, UserId FROM t",
+    "SELECT 1;",
+    "DECLARE @x int SET @x = 1 SELECT @x",
+])
+def test_validator_accepts_read_only_queries(query):
+    assert server.sql_validator.is_read_only_query(query)
+
+
+@pytest.mark.parametrize("query", [
+    "DELETE FROM t",
+    "UPDATE t SET a = 1",
+    "SELECT * INTO t2 FROM t",
+    "SELECT 1; DROP TABLE t",
+    "SELECT 1 EXEC sp_who",
+    "SELECT 1 SHUTDOWN WITH NOWAIT",
+    "SELECT 1 KILL 52",
+    "SELECT 1 BACKUP DATABASE d TO DISK='x'",
+    "SELECT 1 RESTORE DATABASE d FROM DISK='x'",
+    "SELECT 1 DBCC CHECKDB",
+    "SELECT 1 WAITFOR DELAY '00:01:00'",
+    "SELECT * FROM OPENROWSET('SQLNCLI', 'x', 'SELECT 1')",
+    "SELECT * FROM OPENQUERY(srv, 'SELECT 1')",
+    "SELECT 1 RECONFIGURE",
+    "SELECT 1 DENY SELECT ON t TO u",
+    "SELECT 1 USE master",
+    "SELECT 1 BULK INSERT t FROM 'x'",
+    "TRUNCATE TABLE t",
+    "sp_configure",
+])
+def test_validator_rejects_writes_and_admin_commands(query):
+    assert not server.sql_validator.is_read_only_query(query)
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT 1 BEGIN TRAN SELECT * FROM t WITH (TABLOCKX)",
+    "SELECT 1 BEGIN TRANSACTION",
+    "DECLARE @x int SET ROWCOUNT 1 SELECT * FROM t",
+    "DECLARE @x int SET TRANSACTION ISOLATION LEVEL SERIALIZABLE SELECT 1",
+    "DECLARE @x int SET NOCOUNT OFF SELECT 1",
+    "DECLARE c CURSOR GLOBAL FOR SELECT * FROM t",
+])
+def test_validator_rejects_session_changes(query):
+    assert not server.sql_validator.is_read_only_query(query)
+
+
+def test_execute_sql_reports_queries_without_a_result_set(fake_server):
+    fake, db = fake_server
+
+    result = run(db, server.call_tool("execute_sql", {"query": "DECLARE @x int SET @x = 1"}))
+
+    assert result[0].text == "Error: Query did not return a result set"
+
+
+def test_read_resource_rebuilds_header_after_column_added(fake_server):
+    fake, db = fake_server
+
+    async def main():
+        first = await server.read_resource("mssql://t1/data")
+        # ALTER TABLE t1 ADD c, without refresh_tables or a TTL expiry
+        fake.tables["t1"] = (["a", "b", "c"], [(1, 2, 3)])
+        second = await server.read_resource("mssql://t1/data")
+        return first, second
+
+    first, second = run(db, main())
+
+    assert first == "a,b\n1,2\n3,4"
+    assert second == "a,b,c\n1,2,3"
+
+
+def test_read_resource_rebuilds_header_after_column_renamed(fake_server):
+    fake, db = fake_server
+
+    async def main():
+        await server.read_resource("mssql://t1/data")
+        # sp_rename 't1.b', 'c': same column count, different name
+        fake.tables["t1"] = (["a", "c"], [(1, 2)])
+        return await server.read_resource("mssql://t1/data")
+
+    assert run(db, main()) == "a,c\n1,2"
+
+
+def test_table_list_refetch_clears_cached_headers(fake_server, monkeypatch):
+    fake, db = fake_server
+    monkeypatch.setattr(db, "tables_ttl", 0)
+
+    async def main():
+        await server.read_resource("mssql://t1/data")
+        assert "t1" in db.column_headers
+        await db.get_tables()
+        return dict(db.column_headers)
+
+    assert run(db, main()) == {}
+
+
+def test_read_resource_accepts_listed_tables_with_awkward_names(fake_server):
+    fake, db = fake_server
+    for name in ["Merge", "sp_settings", "My Table", "Odd]Name"]:
+        fake.tables[name] = (["a"], [(1,)])
+
+    async def main():
+        resources = await server.list_resources()
+        return {r.name: await server.read_resource(r.uri) for r in resources}
+
+    results = run(db, main())
+
+    assert set(results) == {f"Table: {name}" for name in fake.tables}
+    assert results["Table: My Table"] == "a\n1"
+    assert "SELECT TOP 100 * FROM [Odd]]Name]" in fake.executed
+
+
+def test_read_resource_rejects_unknown_tables(fake_server):
+    fake, db = fake_server
+
+    with pytest.raises(ValueError, match="Unknown table"):
+        run(db, server.read_resource("mssql://t1%5D%3B%20DROP%20TABLE%20t1--/data"))